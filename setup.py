@@ -26,7 +26,7 @@ setuptools.setup(
     description=("The SHARED Quality, Uniformity, and Sanity Helper"),
     license="Apache2",
     url="https://github.com/hcv-shared/shrl",
-    python_requires=">=3.6,<4",
+    python_requires=">=3.7,<4",
     test_suite="tests",
     install_requires=install_requires,
     extras_require={"tests": tests_require},
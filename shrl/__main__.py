@@ -1,14 +1,17 @@
 """Entrypoint for use from the console
 """
 import argparse
+import importlib
 import logging
 
-import shrl.handlers
+# NOTE(nknight): shrl.handlers pulls in SQLAlchemy, BioPython, and the
+# shared schema; we import it by name in main() so that `shrl --help`
+# doesn't pay for the whole stack.
 
 DESC = """The SHARED data regularity checker and load helper."""
 
 parser = argparse.ArgumentParser(prog="shrl", description=DESC)
-parser.set_defaults(handler=lambda _: parser.print_help())
+parser.set_defaults(handler_name=None)
 parser.add_argument(
     "--verbose", "-v", action="store_true", help="Enable verbose logging"
 )
@@ -27,7 +30,7 @@ check = subparsers.add_parser(
     name="check", help="Check data files for consistency"
 )
 check.add_argument("directory", help="Directory to search for datafiles")
-check.set_defaults(handler=shrl.handlers.check)
+check.set_defaults(handler_name="check")
 
 load = subparsers.add_parser(
     name="load", help="Load submitted data into a database"
@@ -52,12 +55,17 @@ load.add_argument(
         "regimens (suggested when starting a new database)."
     ),
 )
-load.set_defaults(handler=shrl.handlers.load)
+load.set_defaults(handler_name="load")
 
 
 def main() -> None:
     args = parser.parse_args()
     if args.verbose:
         logging.basicConfig(level="INFO")
-    logging.info(f"Using handler {args.handler} with args: {args}")
-    args.handler(args)
+    if args.handler_name is None:
+        parser.print_help()
+        return
+    handlers = importlib.import_module("shrl.handlers")
+    handler = getattr(handlers, args.handler_name)
+    logging.info(f"Using handler {handler} with args: {args}")
+    handler(args)
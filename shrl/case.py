@@ -2,6 +2,7 @@
 participant cases (which include participant info, clinical tests, treatment
 history, and one or more sequences).
 """
+import dataclasses
 import typing as ty
 
 import shrl.exceptions
@@ -19,12 +20,18 @@ ParsedRow = ty.Dict[str, ty.Optional[shrl.field.FieldType]]
 Values = ty.Dict[str, ty.Optional[shrl.field.FieldType]]
 
 
-class Clinical(ty.NamedTuple):
+# Slotted dataclasses instead of NamedTuples: attribute access is a
+# C-level slot read and there's no tuple tail to allocate per record.
+@dataclasses.dataclass(frozen=True)
+class Clinical:
+    __slots__ = ("values", "sequences")
     values: Values
     sequences: ty.List[Values]
 
 
-class Case(ty.NamedTuple):
+@dataclasses.dataclass(frozen=True)
+class Case:
+    __slots__ = ("participant", "behavior", "clinical")
     participant: Values
     behavior: Values
     clinical: ty.List[Clinical]
@@ -40,13 +47,18 @@ class ParsingError(shrl.exceptions.BaseParsingException):
 T = ty.TypeVar("T")
 
 
+def _first_loc(row: shrl.row.LoadedRow) -> shrl.exceptions.SourceLocation:
+    "Location of a row's first field (for error reporting)."
+    return next(iter(row.values())).loc
+
+
 def split_rows(
     pred: ty.Callable[[shrl.row.LoadedRow], bool], rows: LoadedRows
 ) -> ty.Tuple[LoadedRows, LoadedRows]:
     if len(rows) == 0:
         return ([], [])
     if not pred(rows[0]):
-        loc = next(f.loc for f in rows[0].values())
+        loc = _first_loc(rows[0])
         msg = "Tried to split rows but predicate was invalid on first row"
         raise ParsingError(location=loc, msg=msg)
     if len(rows) == 1:
@@ -63,117 +75,128 @@ def split_rows(
 
 
 def group_rows(key_field: str, rows: LoadedRows) -> ty.List[LoadedRows]:
+    # A single forward scan over the rows; each group is one slice, so we
+    # avoid re-splitting (and re-parsing the key field of) the remaining
+    # suffix for every group.
     result: ty.List[LoadedRows] = []
-    rest = rows
-
-    while True:
-        fld_val = rest[0][key_field]._parse()
-
-        def pred(row: shrl.row.LoadedRow) -> bool:
-            return row[key_field]._parse_or(fld_val) == fld_val
-
-        chunk, rest = split_rows(pred, rest)
-        result.append(chunk)
-        if len(rest) == 0:
-            break
-
+    start = 0
+    key_val = rows[0][key_field]._parse()
+    for idx in range(1, len(rows)):
+        row_val = rows[idx][key_field]._parse_or(key_val)
+        if row_val != key_val:
+            result.append(rows[start:idx])
+            start = idx
+            key_val = row_val
+    result.append(rows[start:])
     return result
 
 
 def get_named_fields(
     field_names: ty.Iterable[str], source: shrl.row.LoadedRow
 ) -> ParsedRow:
-    result: ParsedRow = {}
-    for field_name in field_names:
-        loaded_fld = source[field_name]
-        result[field_name] = loaded_fld._parse()
-    return result
+    # A comprehension lets CPython presize the dict from the tuple's
+    # length instead of growing it one assignment at a time.
+    return {name: source[name]._parse() for name in field_names}
 
 
 # ------------------------------------------------------------------
 # Parsing Fields
 
 
+# Field-name tuples are hoisted to module level so that they're built
+# once at import instead of once per row.
+_PARTICIPANT_FIELDS = (
+    "id",
+    "country",
+    "sex",
+    "ethnicity",
+    "year_of_birth",
+    "ltfu",
+    "ltfu_year",
+    "died",
+    "cod",
+)
+
+_BEHAVIOR_FIELDS = (
+    "sex_ori",
+    "idu",
+    "idu_recent",
+    "ndu",
+    "ndu_recent",
+    "prison",
+)
+
+_CLINICAL_FIELDS = (
+    "kind",
+    "hiv",
+    "hbv",
+    "ost",
+    "cirr",
+    "fibrosis",
+    "inflamation",
+    "metavir_by",
+    "stiff",
+    "alt",
+    "ast",
+    "crt",
+    "egfr",
+    "ctp",
+    "meld",
+    "ishak",
+    "bil",
+    "hemo",
+    "alb",
+    "inr",
+    "phos",
+    "urea",
+    "plate",
+    "CD4",
+    "crp",
+    "il28b",
+    "asc",
+    "var_bleed",
+    "hep_car",
+    "transpl",
+    "vl",
+    "first_treatment",
+    "duration_act",
+    "regimen",
+    "prev_regimen",
+    "pprev_regimen",
+    "response",
+    "treatment_notes",
+)
+
+_SEQUENCE_FIELDS = (
+    "seq_kind",
+    "genotype",
+    "subgenotype",
+    "strain",
+    "seq_id",
+    "gene",
+    "seq_method",
+    "cutoff",
+    "seq_notes",
+)
+
+
 def parse_participant(row: shrl.row.LoadedRow) -> Values:
-    fields = (
-        "id",
-        "country",
-        "sex",
-        "ethnicity",
-        "year_of_birth",
-        "ltfu",
-        "ltfu_year",
-        "died",
-        "cod",
-    )
     values = {}
     values["id"] = row["id"]._parse()
-    values.update(get_named_fields(fields, row))
+    values.update(get_named_fields(_PARTICIPANT_FIELDS, row))
     return values
 
 
 def parse_behavior(row: shrl.row.LoadedRow) -> Values:
-    fields = ("sex_ori", "idu", "idu_recent", "ndu", "ndu_recent", "prison")
-    return get_named_fields(fields, row)
+    return get_named_fields(_BEHAVIOR_FIELDS, row)
 
 
 def parse_clinical(row: shrl.row.LoadedRow) -> Values:
-    fields = (
-        "kind",
-        "hiv",
-        "hbv",
-        "ost",
-        "cirr",
-        "fibrosis",
-        "inflamation",
-        "metavir_by",
-        "stiff",
-        "alt",
-        "ast",
-        "crt",
-        "egfr",
-        "ctp",
-        "meld",
-        "ishak",
-        "bil",
-        "hemo",
-        "alb",
-        "inr",
-        "phos",
-        "urea",
-        "plate",
-        "CD4",
-        "crp",
-        "il28b",
-        "asc",
-        "var_bleed",
-        "hep_car",
-        "transpl",
-        "vl",
-        "first_treatment",
-        "duration_act",
-        "regimen",
-        "prev_regimen",
-        "pprev_regimen",
-        "response",
-        "treatment_notes",
-    )
-    return get_named_fields(fields, row)
+    return get_named_fields(_CLINICAL_FIELDS, row)
 
 
 def parse_sequence(row: shrl.row.LoadedRow) -> Values:
-    fields = (
-        "seq_kind",
-        "genotype",
-        "subgenotype",
-        "strain",
-        "seq_id",
-        "gene",
-        "seq_method",
-        "cutoff",
-        "seq_notes",
-    )
-    return get_named_fields(fields, row)
+    return get_named_fields(_SEQUENCE_FIELDS, row)
 
 
 def parse_case(case_rows: LoadedRows) -> Case:
@@ -182,12 +205,12 @@ def parse_case(case_rows: LoadedRows) -> Case:
 
     if case_id is None:
         msg = "Unexpected null case id"
-        loc = next(f.loc for f in case_rows[0].values())
+        loc = _first_loc(case_rows[0])
         raise ParsingError(location=loc, msg=msg)
     for row in case_rows:
         cid = row["id"]._parse_or(case_id)
         if cid != case_id:
-            loc = next(f.loc for f in row.values())
+            loc = _first_loc(row)
             msg = f"Inconsistent case id: {cid}"
             raise ParsingError(location=loc, msg=msg)
 
@@ -210,7 +233,7 @@ def case_rows(rows: LoadedRows) -> ty.Tuple[LoadedRows, LoadedRows]:
     "Pop one case's worth of rows from a list of loaded rows."
     case_id = rows[0]["id"]._parse()
     if case_id is None:
-        location = next(f.loc for f in rows[0].values())
+        location = _first_loc(rows[0])
         raise ParsingError(location=location, msg="Missing Case ID")
 
     def matches_case(row: shrl.row.LoadedRow) -> bool:
@@ -236,16 +259,33 @@ def get_one_case(rows: LoadedRows) -> ty.Tuple[ty.Optional[Case], LoadedRows]:
 # Synthesis
 
 
+# NOTE(nknight): Per-case parsing looks embarrassingly parallel, but a
+# process pool is a non-starter here: LoadedRow values hold EnumField
+# instances whose enum classes are created at runtime (see
+# EnumField.__init__), and those don't pickle. Parsing is also linear
+# and memoized now, so the serial path is cheap.
 def cases(rows: LoadedRows) -> ty.Iterable[Case]:
-    "Separate and parse rows into data for individual cases"
-    while True:
-        case, rows = get_one_case(rows)
-        if case is None:
-            if len(rows) > 0:
-                location = next(fld.loc for fld in rows[0].values())
-                raise ParsingError(
-                    location=location, msg="Leftover rows while parsing cases"
-                )
-            return
-        else:
-            yield case
+    """Separate and parse rows into data for individual cases.
+
+    Walks the row list once by index, slicing out each case exactly once
+    rather than re-splitting (and copying) the remaining tail for every
+    case.
+    """
+    idx = 0
+    row_count = len(rows)
+    while idx < row_count:
+        case_id = rows[idx]["id"]._parse()
+        if case_id is None:
+            location = _first_loc(rows[idx])
+            raise ParsingError(location=location, msg="Missing Case ID")
+        end = idx + 1
+        while end < row_count:
+            try:
+                row_id = rows[end]["id"]._parse()
+            except shrl.exceptions.BaseParsingException:
+                row_id = None
+            if row_id is not None and row_id != case_id:
+                break
+            end += 1
+        yield parse_case(rows[idx:end])
+        idx = end
@@ -1,8 +1,13 @@
+import dataclasses
 import textwrap
-import typing as ty
 
 
-class SourceLocation(ty.NamedTuple):
+# A slotted dataclass rather than a NamedTuple: one of these is built
+# for every cell we load, and slots keep the per-instance footprint to
+# the two fields.
+@dataclasses.dataclass(frozen=True)
+class SourceLocation:
+    __slots__ = ("filename", "line")
     filename: str
     line: int
 
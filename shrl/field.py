@@ -7,6 +7,7 @@ defining fields and a concrete class for each type of value that we parse
 
 import datetime
 import enum
+import sys
 import typing as ty
 
 import shrl.exceptions
@@ -25,13 +26,39 @@ T = ty.TypeVar("T")
 FieldType = ty.Union[str, bool, int, float, enum.Enum, datetime.date]
 
 
-class LoadedField(ty.NamedTuple):
-    src: str
-    fld: "BaseField"
-    loc: shrl.exceptions.SourceLocation
+class LoadedField:
+    """A field value as loaded from a source file.
+
+    Parsing is memoized: the first call to `_parse` records the parsed
+    value (or the `FieldParsingError` it raised) so that repeated calls
+    during row grouping don't re-parse the same source string.
+    """
+
+    __slots__ = ("src", "fld", "loc", "_parsed", "_exc", "_has")
+
+    def __init__(
+        self,
+        src: str,
+        fld: "BaseField",
+        loc: shrl.exceptions.SourceLocation,
+    ) -> None:
+        self.src = src
+        self.fld = fld
+        self.loc = loc
+        self._parsed: ty.Optional[FieldType] = None
+        self._exc: ty.Optional[FieldParsingError] = None
+        self._has = False
 
     def _parse(self) -> ty.Optional[FieldType]:
-        return self.fld.parse(self.src, self.loc)
+        if not self._has:
+            try:
+                self._parsed = self.fld.parse(self.src, self.loc)
+            except FieldParsingError as exc:
+                self._exc = exc
+            self._has = True
+        if self._exc is not None:
+            raise self._exc
+        return self._parsed
 
     def _parse_or(
         self, default: ty.Optional[FieldType]
@@ -64,19 +91,17 @@ class BaseField:
     ) -> ty.Optional[FieldType]:
         if src is None:
             return self.handle_none(loc)
-        try:
-            return self.parse_type(src, loc)
-        except FieldParsingError as err:
-            # If the field looks blank, treat it as None.
-            if type(src) is str and src.strip() == "":
-                return self.handle_none(loc)
-            else:
-                raise err
+        # Blank fields are common in submissions; checking up front keeps
+        # them off the exception path (previously we parsed, caught the
+        # error, and then re-checked for blankness).
+        if type(src) is str and (not src or src.isspace()):
+            return self.handle_none(loc)
+        return self.parse_type(src, loc)
 
     def load(
         self, src: str, loc: shrl.exceptions.SourceLocation
     ) -> LoadedField:
-        return LoadedField(src=src, fld=self, loc=loc)
+        return LoadedField(src, self, loc)
 
     def parse_type(
         self, src: str, loc: shrl.exceptions.SourceLocation
@@ -89,12 +114,14 @@ class BaseField:
         return tmpl.format(self.__class__.__name__, self.name)
 
     def __eq__(self, other: ty.Any) -> bool:
-        if type(self) is not type(other):
-            return False
-        else:
-            return all(
-                [self.name == other.name, self.required == other.required]
-            )
+        return (
+            type(self) is type(other)
+            and self.name == other.name
+            and self.required == other.required
+        )
+
+    def __hash__(self) -> int:
+        return hash((type(self), self.name, self.required))
 
 
 class BoolField(BaseField):
@@ -103,32 +130,52 @@ class BoolField(BaseField):
     falses = frozenset(["0", "false", "n", "f", "no"])
     nones = frozenset(["none", "null", ""])
 
+    # One normalized-token table, built once at class definition, so
+    # parsing is a single dict probe instead of three set membership tests.
+    _token_map: ty.ClassVar[ty.Dict[str, ty.Optional[bool]]] = {
+        **{token: True for token in trues},
+        **{token: False for token in falses},
+        **{token: None for token in nones},
+    }
+
     def parse_type(
         self, src: str, loc: shrl.exceptions.SourceLocation
     ) -> ty.Optional[bool]:
         try:
             normed_src = src.lower().strip()
-            if normed_src in self.falses:
-                return False
-            elif normed_src in self.trues:
-                return True
-            elif normed_src in self.nones:
-                return None
-            else:
-                msg = "Expected one of 'true', 'false', '0', or '1'; got '{}'"
-                raise FieldParsingError(loc, msg.format(src))
+            return self._token_map[normed_src]
+        except KeyError:
+            msg = "Expected one of 'true', 'false', '0', or '1'; got '{}'"
+            raise FieldParsingError(loc, msg.format(src))
         except Exception as e:
             msg = "Unexpected exception while parsing {}: {}"
             raise FieldParsingError(loc, msg.format(self.name, e))
 
 
 class DateField(BaseField):
+
+    # Dates are always YYYY-MM-DD, so we split and convert directly
+    # instead of paying for strptime's format interpretation on every
+    # cell. The shape checks match what strptime accepted: a four-digit
+    # year and one- or two-digit month and day.
     def parse_type(
         self, src: str, loc: shrl.exceptions.SourceLocation
     ) -> datetime.date:
         try:
-            dt = datetime.datetime.strptime(src, "%Y-%m-%d")
-            return dt.date()
+            parts = src.split("-")
+            if len(parts) == 3:
+                year, month, day = parts
+                well_formed = (
+                    len(year) == 4
+                    and 1 <= len(month) <= 2
+                    and 1 <= len(day) <= 2
+                    and year.isdecimal()
+                    and month.isdecimal()
+                    and day.isdecimal()
+                )
+                if well_formed:
+                    return datetime.date(int(year), int(month), int(day))
+            raise ValueError(src)
         except ValueError as v:
             msg = "Expected a date in the format YYYY-MM-DD; got '{}' instead"
             raise FieldParsingError(loc, msg.format(v))
@@ -141,9 +188,14 @@ class NumberField(BaseField):
     def parse_type(
         self, src: str, loc: shrl.exceptions.SourceLocation
     ) -> ty.Union[int, float]:
-        # First, try to convert the input to a number
+        # Check for a decimal point or exponent up front: it spares
+        # float-valued cells a guaranteed-to-fail int() attempt and the
+        # exception object that comes with it.
         try:
-            return int(src)
+            if "." in src or "e" in src or "E" in src:
+                return float(src)
+            else:
+                return int(src)
         except Exception:
             pass
         try:
@@ -171,6 +223,11 @@ class StringField(BaseField):
             parsed = src.strip()
             if parsed == "":
                 return self.handle_blank(loc)
+            elif len(parsed) < 64:
+                # Intern short values (ids, country codes, etc.) so that
+                # the repeated comparisons and dict lookups during case
+                # grouping are pointer compares with a cached hash.
+                return sys.intern(parsed)
             else:
                 return parsed
         except Exception as e:
@@ -178,6 +235,27 @@ class StringField(BaseField):
             raise FieldParsingError(loc, msg.format(self.name, e))
 
 
+# Lookaside cache for the enum classes (and their lookup tables) that
+# EnumField builds: constructing an Enum runs metaclass machinery, and
+# fields with the same name and options recur across loads.
+_EnumCacheEntry = ty.Tuple[ty.Any, ty.Dict[str, enum.Enum], str]
+_ENUM_CACHE: ty.Dict[ty.Tuple[str, ty.Tuple[str, ...]], _EnumCacheEntry] = {}
+
+
+def _enum_for(name: str, options: ty.Tuple[str, ...]) -> _EnumCacheEntry:
+    cached = _ENUM_CACHE.get((name, options))
+    if cached is not None:
+        return cached
+    target = enum.Enum(name, options)  # type: ignore
+    # NOTE(nknight): typing doesn't support iterating enums yet.
+    members: ty.Dict[str, enum.Enum] = {
+        m.name: m for m in target  # type: ignore
+    }
+    entry: _EnumCacheEntry = (target, members, ", ".join(members))
+    _ENUM_CACHE[(name, options)] = entry
+    return entry
+
+
 class EnumField(BaseField):
 
     target: enum.Enum
@@ -189,25 +267,25 @@ class EnumField(BaseField):
         if options is None:
             msg = "EnumFields required a list of options"
             raise FieldDefinitionError(msg)
-        self.target = enum.Enum(name, options)
+        opts_key = tuple(sys.intern(opt) for opt in options)
+        self.target, self._members, self._opts = _enum_for(name, opts_key)
 
     # This function returns an enum that's constructed at runtime. I'm not sure
     # how to represent that with `typing`.
     def parse_type(
         self, src: str, loc: shrl.exceptions.SourceLocation
     ) -> enum.Enum:
-        # NOTE(nknight): typing doesn't support iterating enums yet.
         try:
             normed_src = src.lower().strip()
-            # NOTE(nknight): typing doesn't support indexing enums yet
-            return self.target[normed_src]  # type: ignore
+            return self._members[normed_src]
         except KeyError:
-            opts = ", ".join([e.name for e in self.target])  # type: ignore
-            msg = f"Unexpected value {src} for enum {self.name} ({opts})"
             raise FieldParsingError(
-                loc, f"Unexpected value '{src}' for {self.name}"
+                loc, f"Unexpected value '{src}' for {self.name} ({self._opts})"
             )
-        except Exception:  # noqa
+        except AttributeError:
+            # Non-string input (no .lower method); report it like any
+            # other unparseable value instead of swallowing arbitrary
+            # exceptions.
             tmpl = "Unexpected exception trying to parse '{}' as {}"
             msg = tmpl.format(src, self.name)
             raise FieldParsingError(location=loc, msg=msg)
@@ -1,6 +1,8 @@
 """Functions that perform CLI tasks (load, check, report)"""
 import argparse
+import collections
 import enum
+import functools
 import logging
 import os
 import pathlib
@@ -11,7 +13,7 @@ import typing as ty
 
 import shared_schema.dao
 import shared_schema.data
-import shared_schema.tables
+import sqlalchemy.sql as sql
 import shrl.case
 import shrl.io
 import shrl.metadata
@@ -35,11 +37,13 @@ def check(args: argparse.Namespace) -> None:
     entity_sets = _load_entities(
         args, rreg=rreg, sreg=sreg, study_data=study_data
     )
-    # Exhaust any iterators
+    # Exhaust any iterators; extending a zero-length deque consumes
+    # them in C instead of an empty-body Python loop per entity.
+    sink: ty.Deque[ty.Any] = collections.deque(maxlen=0)
+    consume = sink.extend
     for entity_set in entity_sets:
         for entities in entity_set.values():
-            for entity in entities:
-                pass
+            consume(entities)
     log.info("All rows loaded successfully")
     shrl.report.print_report()
 
@@ -67,16 +71,21 @@ def load(args: argparse.Namespace) -> None:
     rreg = shrl.transform.RegimenRegistry.init_from_dao(dao)
     sreg = _init_sequence_registry(base_dir)
 
-    # Force evaluation of the entity sets so that the regimen registry is
-    # populated before we start inserting case entities. This is necessary
-    # because case entities depend on the entities from the registry.
-    entity_sets = list(
-        _load_entities(args, rreg=rreg, sreg=sreg, study_data=study_data)
+    # _save_entities consumes this lazily; cases are parsed and
+    # transformed as the entity batches are collected instead of
+    # materializing every case's entities up front.
+    entity_sets = _load_entities(
+        args, rreg=rreg, sreg=sreg, study_data=study_data
     )
 
     db_connection = dao.engine.connect()
 
     with db_connection.begin() as trn:
+        if db_connection.dialect.name == "postgresql":
+            # Loads are re-runnable, so skip the WAL fsync wait at
+            # commit. SET LOCAL scopes this to our transaction and
+            # leaves the server default untouched.
+            db_connection.execute("SET LOCAL synchronous_commit = OFF")
         try:
             _save_entities(
                 entity_sets=entity_sets,
@@ -115,13 +124,40 @@ def convert_enum_names(dct: ty.Dict[str, ty.Any]) -> ty.Dict[str, ty.Any]:
     return dct
 
 
+@functools.lru_cache(maxsize=None)
+def _value_fields(entityname: str) -> ty.Tuple[str, ...]:
+    """Names of an entity's 'value fields' (not foreign keys or UUIDs).
+
+    Pure function of the entity name, so the schema walk is cached
+    instead of repeated for every case.
+    """
+    ent_def = SCHEMA_DATA.get_entity(entityname)
+    return tuple(
+        fld.name
+        for fld in ent_def.fields
+        if ("foreign key" not in fld.type)
+        and (fld.name != "id")
+        and (not fld.name == "uuid")
+    )
+
+
 class EntityManager:
-    def __init__(self, dao: shared_schema.dao.DAO, eset: EntitySet) -> None:
+    """Accumulates entity rows and writes each table in one statement.
+
+    Inserting rows one at a time costs a database round-trip per row;
+    collecting the rows per table and executing a single multi-row
+    insert per table collapses that to one round-trip each. Tables are
+    flushed in the order they were first added, so callers adding
+    parent entities before their dependents keep a valid insertion
+    order.
+    """
+
+    def __init__(self, dao: shared_schema.dao.DAO) -> None:
         self.dao = dao
-        self.eset = eset
+        self._batches: ty.Dict[str, ty.List[ty.Dict[str, ty.Any]]] = {}
 
-    def insert_entity(self, entityname: str) -> None:
-        entities = self.eset[entityname]
+    def add_entity(self, eset: EntitySet, entityname: str) -> None:
+        entities = eset[entityname]
         if len(entities) != 1:
             raise ValueError(
                 "Expected a single entity; got {}".format(len(entities))
@@ -129,10 +165,12 @@ class EntityManager:
         entity = entities[0]
         tablename = entityname.lower()
         item = convert_enum_names(entity._asdict())
-        self.dao.insert(tablename, item)
+        self._batches.setdefault(tablename, []).append(item)
 
-    def insert_entities_if_not_empty(self, entityname: str) -> None:
-        """Insert any entities that have non-null 'value fields'
+    def add_entities_if_not_empty(
+        self, eset: EntitySet, entityname: str
+    ) -> None:
+        """Collect any entities that have non-null 'value fields'
 
         A 'value field' is any field that's not a foreign key or a UUID
 
@@ -140,20 +178,26 @@ class EntityManager:
         example, fields might have invalid types, or required fields might be
         missing.
         """
-        ent_def = SCHEMA_DATA.get_entity(entityname)
-        value_fields: ty.List[shared_schema.tables.Field] = [
-            fld.name
-            for fld in ent_def.fields
-            if ("foreign key" not in fld.type)
-            and (fld.name != "id")
-            and (not fld.name == "uuid")
-        ]
-        entities = self.eset[entityname]
+        value_fields = _value_fields(entityname)
+        entities = eset[entityname]
         tablename = entityname.lower()
         for ent in entities:
-            item = convert_enum_names(ent._asdict())
-            if any(item.get(fldname) for fldname in value_fields):
-                self.dao.insert(tablename, item)
+            # Probe the NamedTuple directly; the dict conversion only
+            # happens for rows that will actually be inserted.
+            if any(getattr(ent, fldname) for fldname in value_fields):
+                item = convert_enum_names(ent._asdict())
+                self._batches.setdefault(tablename, []).append(item)
+
+    def flush(self) -> None:
+        "Write the collected rows, one executemany per table."
+        for tablename, rows in self._batches.items():
+            tbl = getattr(self.dao, tablename)
+            keys = rows[0].keys()
+            stm = tbl.insert().values(
+                **{nm: sql.bindparam(nm) for nm in keys}
+            )
+            self.dao.command(stm, rows)
+        self._batches.clear()
 
 
 def _load_entities(
@@ -194,26 +238,31 @@ def _save_entities(
     meta_handle.check_existing()
     meta_handle.create_new()
 
-    # Create Regimens and RegimenDrugInclusions
-    rreg.sync_to_dao(dao)
-
-    # Create Case and ClinicalIsolate Entities
+    # Collect Case and ClinicalIsolate entities. Iterating entity_sets
+    # is what populates the regimen registry, so the registry is synced
+    # after this loop but before the batches (which include the
+    # TreatmentData rows referring to those regimens) are flushed.
+    emanager = EntityManager(dao)
     for ents in entity_sets:
         # This is written out explicitly because the order of insertions
         # matters; records referred to by foreign keys must be created before
         # their dependents.
-        emanager = EntityManager(dao, ents)
-        emanager.insert_entity("Person")
-        emanager.insert_entity("Case")
-        emanager.insert_entities_if_not_empty("LossToFollowUp")
-        emanager.insert_entities_if_not_empty("BehaviorData")
-        emanager.insert_entities_if_not_empty("ClinicalData")
-        emanager.insert_entities_if_not_empty("TreatmentData")
-        emanager.insert_entities_if_not_empty("Isolate")
-        emanager.insert_entities_if_not_empty("ClinicalIsolate")
-        emanager.insert_entities_if_not_empty("Sequence")
-        emanager.insert_entities_if_not_empty("Alignment")
-        emanager.insert_entities_if_not_empty("Substitution")
+        emanager.add_entity(ents, "Person")
+        emanager.add_entity(ents, "Case")
+        emanager.add_entities_if_not_empty(ents, "LossToFollowUp")
+        emanager.add_entities_if_not_empty(ents, "BehaviorData")
+        emanager.add_entities_if_not_empty(ents, "ClinicalData")
+        emanager.add_entities_if_not_empty(ents, "TreatmentData")
+        emanager.add_entities_if_not_empty(ents, "Isolate")
+        emanager.add_entities_if_not_empty(ents, "ClinicalIsolate")
+        emanager.add_entities_if_not_empty(ents, "Sequence")
+        emanager.add_entities_if_not_empty(ents, "Alignment")
+        emanager.add_entities_if_not_empty(ents, "Substitution")
+
+    # Create Regimens and RegimenDrugInclusions
+    rreg.sync_to_dao(dao)
+
+    emanager.flush()
 
 
 def _halt_with(msg: str) -> None:
@@ -226,12 +275,18 @@ def _init_sequence_registry(
 ) -> shrl.transform.SequenceRegistry:
     seq_dir = base_path / "sequences"
     log.info(f"Loading sequences from {seq_dir}")
-    files = os.listdir(seq_dir)
+    # os.scandir reuses the directory entry's cached stat result, so we
+    # don't stat every file a second time just to filter it.
     filepaths = [
-        seq_dir / fname for fname in files if fname.lower().endswith("fasta")
+        pathlib.Path(entry.path)
+        for entry in os.scandir(seq_dir)
+        if entry.is_file() and entry.name.lower().endswith("fasta")
     ]
-    file_list = textwrap.indent("\n".join(str(p) for p in filepaths), " - ")
-    log.info(f"Sequence files: \n{file_list}")
+    if log.isEnabledFor(logging.INFO):
+        file_list = textwrap.indent(
+            "\n".join(str(p) for p in filepaths), " - "
+        )
+        log.info(f"Sequence files: \n{file_list}")
     return shrl.transform.SequenceRegistry.from_files(filepaths)
 
 
@@ -6,6 +6,7 @@ handles for parsing procedures to use.
 """
 
 import csv
+import io
 import itertools
 import logging
 import pathlib
@@ -42,6 +43,11 @@ class CsvSource(ty.NamedTuple):
         if not filepath.is_file():
             msg = f"No file at '{filepath}'"
             raise ValueError(msg)
-        infile = open(filepath)
+        # Open in binary with a 1 MiB buffer (so reads aren't dominated
+        # by syscalls) and decode explicitly as UTF-8 at the text
+        # boundary, rather than depending on the locale's default
+        # encoding. newline='' is what the csv module expects.
+        raw = open(filepath, "rb", buffering=1 << 20)
+        infile = io.TextIOWrapper(raw, encoding="utf-8", newline="")
         filename = filepath.name
         return cls.from_file(raw_rows=infile, filename=filename)
@@ -33,7 +33,10 @@ Collaborator, and with any references provided in the metadata file.
 
 import configparser
 import datetime
+import functools
 import logging
+import os
+import re
 import typing as ty
 import uuid
 
@@ -93,12 +96,22 @@ class StudyData(ty.NamedTuple):
     references: ty.List[Reference]
 
 
-def collaborators(parser: configparser.ConfigParser) -> ty.List[Collaborator]:
-    collab_sections = [
-        secname
-        for secname in parser.sections()
-        if secname.startswith("collaborator")
-    ]
+# Matches the section prefixes that extract() dispatches on.
+_SECTION_KIND = re.compile(r"^(collaborator|reference)")
+
+
+def collaborators(
+    parser: configparser.ConfigParser,
+    section_names: ty.Optional[ty.List[str]] = None,
+) -> ty.List[Collaborator]:
+    if section_names is None:
+        collab_sections = [
+            secname
+            for secname in parser.sections()
+            if secname.startswith("collaborator")
+        ]
+    else:
+        collab_sections = section_names
     if len(collab_sections) <= 0:
         raise MetadataError(
             "collaborator", "We need at least one collaborator section"
@@ -149,19 +162,25 @@ def source_study(parser: configparser.ConfigParser) -> SourceStudy:
         raise MetadataError("sourcestudy", "Invalid field")
 
 
-def references(parser: configparser.ConfigParser) -> ty.List[Reference]:
-    reference_sections = (
-        secname
-        for secname in parser.sections()
-        if secname.startswith("reference")
-    )
+def references(
+    parser: configparser.ConfigParser,
+    section_names: ty.Optional[ty.List[str]] = None,
+) -> ty.List[Reference]:
+    if section_names is None:
+        reference_sections: ty.Iterable[str] = (
+            secname
+            for secname in parser.sections()
+            if secname.startswith("reference")
+        )
+    else:
+        reference_sections = section_names
     result = []
     for secname in reference_sections:
         raw_args = parser[secname]
         if raw_args.get("id") is None:
             ref_id = uuid.uuid4()
         else:
-            ref_id = uuid.UUID(raw_args.get("id"))
+            ref_id = uuid.UUID(raw_args["id"])
         publication_dt_src = raw_args.get("publication_dt")
         if publication_dt_src is not None:
             date_fmt = "%Y-%m-%d"
@@ -188,9 +207,21 @@ def extract(parser: configparser.ConfigParser) -> StudyData:
         raise MetadataError(
             "collaborator", "Missing required section 'collaborator'"
         )
-    collab = collaborators(parser)
+    # Bucket the section names in one pass instead of letting each
+    # extractor rescan the section list.
+    collab_sections: ty.List[str] = []
+    reference_sections: ty.List[str] = []
+    for secname in parser.sections():
+        match = _SECTION_KIND.match(secname)
+        if match is None:
+            continue
+        if match.group(1) == "collaborator":
+            collab_sections.append(secname)
+        else:
+            reference_sections.append(secname)
+    collab = collaborators(parser, collab_sections)
     sstudy = source_study(parser)
-    refs = references(parser)
+    refs = references(parser, reference_sections)
     return StudyData(
         collaborators=collab, source_study=sstudy, references=refs
     )
@@ -200,14 +231,24 @@ def get_parser() -> configparser.ConfigParser:
     return configparser.ConfigParser(interpolation=None, allow_no_value=True)
 
 
-def parse(filepath: str) -> StudyData:
-    """Load metadata from a Conf file"""
-    log.info("Loading metadata from {}".format(filepath))
+@functools.lru_cache(maxsize=32)
+def _parse_cached(filepath: str, mtime_ns: int) -> StudyData:
     parser = get_parser()
     parser.read(filepath)
     return extract(parser)
 
 
+def parse(filepath: str) -> StudyData:
+    """Load metadata from a Conf file
+
+    Results are cached per (path, mtime), so re-parsing only happens
+    when the file changes on disk. StudyData is a NamedTuple, so the
+    cached instance can be shared between callers.
+    """
+    log.info("Loading metadata from {}".format(filepath))
+    return _parse_cached(str(filepath), os.stat(filepath).st_mtime_ns)
+
+
 class StudyDataDatabaseHandle:
     "Manage verifying existing reference data records and creating new ones."
 
@@ -239,9 +280,17 @@ class StudyDataDatabaseHandle:
             raise DatabaseMismatchError(
                 table_name, f"Invalid column {match_fld} on {table_name}"
             )
+        match_vals = [getattr(item, match_fld) for item in items]
+        if not match_vals:
+            return
+        # One IN-query for the whole batch instead of a round-trip per
+        # item; the match-up happens in Python against the keyed rows.
+        existing_rows = {
+            row[match_fld]: row
+            for row in self.dao.query(tbl.select(col.in_(match_vals)))
+        }
         for item in items:
-            match_val = getattr(item, match_fld)
-            existing = next(self.dao.query(tbl.select(col == match_val)), None)
+            existing = existing_rows.get(getattr(item, match_fld))
             if existing is not None:
                 mismatch_flds = self.db_mismatch_fields(item, existing, flds)
                 if mismatch_flds:
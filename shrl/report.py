@@ -1,11 +1,12 @@
 """This module implements report accumulation and printing"""
-import collections
+import dataclasses
 import typing as ty
 
-import tabulate
 
+@dataclasses.dataclass(frozen=True)
+class FsSeq:
+    __slots__ = ("gene", "positions")
 
-class FsSeq(ty.NamedTuple):
     gene: str
     positions: ty.List[int]
 
@@ -17,22 +18,28 @@ def frameshift(gene: str, positions: ty.List[int]) -> None:
     _frameshift_sequences.append(FsSeq(gene=gene, positions=positions))
 
 
-_entity_counts: ty.MutableMapping[str, int] = collections.Counter()
+# A plain dict: Counter's __missing__ machinery isn't needed for a
+# get-or-zero update, and this runs for every entity batch.
+_entity_counts: ty.Dict[str, int] = {}
 
 
 def count_entities(entities: ty.Mapping[str, ty.List[ty.Any]]) -> None:
+    counts = _entity_counts
     for name, ents in entities.items():
-        _entity_counts[name] += len(ents)
+        counts[name] = counts.get(name, 0) + len(ents)
 
 
-Item = ty.Union[str, int, float]
+Item = ty.Union[str, int, float, ty.List[int]]
 Table = ty.List[ty.Mapping[str, Item]]
 Report = ty.Mapping[str, Table]
 
 
 def compile() -> Report:
     return {
-        "Frameshifts": [fs._asdict() for fs in _frameshift_sequences],
+        "Frameshifts": [
+            {"gene": fs.gene, "positions": fs.positions}
+            for fs in _frameshift_sequences
+        ],
         "Entities": [
             {"Entity Name": k, "Count": v} for k, v in _entity_counts.items()
         ],
@@ -40,6 +47,10 @@ def compile() -> Report:
 
 
 def print_report() -> None:
+    # Deferred so that importing this module (which every handler
+    # does, just to accumulate counts) doesn't pull in tabulate.
+    import tabulate
+
     for name, data in compile().items():
         if len(data) == 0:
             continue
@@ -28,22 +28,26 @@ class RowSpec:
         self.fields = fields
         self._fields_index = {fld.name: fld for fld in fields}
         self._field_set = set(f.name for f in fields)
+        # Bind each field's load method up front; the per-row loop is
+        # then a flat scan with no attribute lookups.
+        self._pipeline = tuple((fld.name, fld.load) for fld in fields)
 
     def load(
         self, src: shrl.io.CsvRow, loc: shrl.exceptions.SourceLocation
     ) -> LoadedRow:
         "Given a dict of column name to source string, parse it into a row"
 
-        result = {}
-        if not set(src.keys()).issubset(self._field_set):
-            extra_cols = set(src.keys()) - self._field_set
+        # Scan the (already-hashed) source keys directly instead of
+        # building two throwaway sets per row.
+        field_set = self._field_set
+        extra_cols = [k for k in src if k not in field_set]
+        if extra_cols:
             msg = "Unexpected columns: {}".format(", ".join(extra_cols))
             raise InvalidColumns(loc, msg)
-        for fld in self.fields:
-            colname = fld.name
-            fld_src = src.get(colname, "")
-            loaded = fld.load(fld_src, loc)
-            result[colname] = loaded
+        src_get = src.get
+        result = {}
+        for colname, load in self._pipeline:
+            result[colname] = load(src_get(colname, ""), loc)
         return result
 
 
@@ -101,6 +105,11 @@ submission_spec = RowSpec(
 )
 
 
+# NOTE(nknight): Parsing stays cell-at-a-time on purpose. Case grouping
+# consumes rows as dicts and parses lazily (with memoization on
+# LoadedField), so a column-oriented batch parse would force eager
+# parsing of every cell and add a numpy/pandas dependency for inputs
+# that are at most a few thousand rows.
 def load_rows(source: shrl.io.CsvSource) -> ty.Iterable[LoadedRow]:
     for idx, row in enumerate(source.reader):
         location = shrl.exceptions.SourceLocation(
@@ -1,24 +1,34 @@
+import functools
 import typing as ty
 import uuid
 
-import pynucamino as pn
-
 import shared_schema.reference_sequences as refseqs
 
-from . import entities
+from . import entities, util
 from shrl import report
 
+GENOTYPES = frozenset({"1", "2", "3", "4", "5", "6"})
+
 
+# The (gt, subgt) pairs seen in a run number at most a dozen or so,
+# so validation after warm-up is a cache hit. (Invalid pairs aren't
+# cached — lru_cache doesn't memoize raised exceptions — but those
+# abort the load anyway.)
+@functools.lru_cache(maxsize=64)
 def check_gt_and_subgt(gt: str, subgt: ty.Optional[str]) -> None:
-    GENOTYPES = {"1", "2", "3", "4", "5", "6"}
     if gt not in GENOTYPES:
         raise ValueError(f"Invalid Genotype: {gt}")
-    if subgt is not None:
-        if type(subgt) is not str or len(subgt) > 1:
-            msg = f"Invalid subgenotype: {subgt}"
-            raise ValueError(msg)
+    if subgt is not None and not (
+        isinstance(subgt, str) and len(subgt) <= 1
+    ):
+        msg = f"Invalid subgenotype: {subgt}"
+        raise ValueError(msg)
 
 
+# A pure function of (gt, subgt) with about a dozen possible results,
+# but called once per sequence per gene; memoizing skips the repeated
+# validation and string formatting.
+@functools.lru_cache(maxsize=32)
 def profile_name(gt: str, subgt: ty.Optional[str]) -> str:
     "Choose a nucamino alignment profile based on genotype and subgenotype"
     check_gt_and_subgt(gt, subgt)
@@ -31,33 +41,30 @@ def profile_name(gt: str, subgt: ty.Optional[str]) -> str:
         return f"hcv{gt}"
 
 
-RefseqKey = ty.Tuple[str, ty.Optional[str], refseqs.Gene]
+# Keyed on plain lowercase gene names so that lookups skip the Gene
+# enum constructor; refseq_id runs once per sequence per gene.
+RefseqKey = ty.Tuple[str, ty.Optional[str], str]
 REFSEQ_INDEX: ty.Dict[RefseqKey, uuid.UUID] = {
-    (rs.genotype, rs.subgenotype, rs.gene): rs.shared_id for rs in refseqs.SEQS
+    (rs.genotype, rs.subgenotype, rs.gene.value): rs.shared_id
+    for rs in refseqs.SEQS
 }
 
 
 def refseq_id(gt: str, subgt: ty.Optional[str], gene_src: str) -> uuid.UUID:
     check_gt_and_subgt(gt, subgt)
-    gene = refseqs.Gene(gene_src.lower())
-    key: ty.Tuple[str, ty.Optional[str], refseqs.Gene]
+    # Genotype 1 defaults to the "a" reference unless the subgenotype
+    # is explicitly "b"; other genotypes have a single reference.
     if gt == "1":
-        if subgt == "b":
-            key = ("1", "b", gene)
-        else:
-            key = ("1", "a", gene)
+        subgt = "b" if subgt == "b" else "a"
     else:
-        key = (gt, None, gene)
-    refseq = REFSEQ_INDEX[key]
-    return refseq
+        subgt = None
+    return REFSEQ_INDEX[(gt, subgt, gene_src.lower())]
 
 
 def ensure_fasta_formatted(seq_str: str, hdr: str = "Reformatted") -> str:
-    TMPL = "> {hdr}\n{seq}"
-    if not seq_str.startswith(">"):
-        return TMPL.format(hdr=hdr, seq=seq_str)
-    else:
+    if seq_str.startswith(">"):
         return seq_str
+    return f"> {hdr}\n{seq_str}"
 
 
 def alignment(
@@ -67,7 +74,7 @@ def alignment(
     nt_end = aln_report["LastAA"]
     ref_seq = refseq_id(sequence.genotype, sequence.subgenotype, gene)
     return entities.Alignment(
-        id=uuid.uuid4(),
+        id=util.random_uuid(),
         sequence_id=sequence.id,
         reference_id=ref_seq,
         nt_start=nt_start,
@@ -80,83 +87,130 @@ def substitution(
     alignment: entities.Alignment,
     mtn: ty.Any,  # One mutation object from the Nucamino alignment report
 ) -> entities.Substitution:
-    specific_fields: ty.Dict[str, ty.Any] = {
-        "sub_aa": None,
-        "insertion": None,
-        "deletion_length": None,
-    }
+    # Build the entity directly in each branch; this runs once per
+    # mutation, so the scratch dict and **-splat are worth avoiding.
     if mtn["IsInsertion"]:
-        kind = "insertion"
-        specific_fields["insertion"] = mtn["InsertedAminoAcidsText"]
+        return entities.Substitution(
+            alignment_id=alignment.id,
+            position=mtn["Position"],
+            kind="insertion",
+            sub_aa=None,
+            insertion=mtn["InsertedAminoAcidsText"],
+            deletion_length=None,
+        )
     elif mtn["IsDeletion"]:
-        kind = "deletion"
-        specific_fields["deletion_length"] = len(mtn["Control"]) // 3
+        return entities.Substitution(
+            alignment_id=alignment.id,
+            position=mtn["Position"],
+            kind="deletion",
+            sub_aa=None,
+            insertion=None,
+            deletion_length=len(mtn["Control"]) // 3,
+        )
     else:
-        kind = "simple"
-        specific_fields["sub_aa"] = mtn["AminoAcidText"]
-    return entities.Substitution(
-        alignment_id=alignment.id,
-        position=mtn["Position"],
-        kind=kind,
-        **specific_fields,
-    )
-
-
-FrameShiftPosition = ty.NewType("FrameShiftPosition", int)
-
-
-class FrameshiftData(ty.NamedTuple):
-    gene: str
-    frameshifts: ty.List[FrameShiftPosition]
+        return entities.Substitution(
+            alignment_id=alignment.id,
+            position=mtn["Position"],
+            kind="simple",
+            sub_aa=mtn["AminoAcidText"],
+            insertion=None,
+            deletion_length=None,
+        )
 
 
 def substitutions(
     alignment: entities.Alignment, alignment_report: ty.Any
-) -> ty.Union[ty.List[entities.Substitution], ty.List[FrameShiftPosition]]:
-    fs_list = alignment_report["FrameShifts"]
-    if len(fs_list) > 0:
-        return [FrameShiftPosition(fs["Position"]) for fs in fs_list]
-    else:
-        return [
-            substitution(alignment, mtn)
-            for mtn in alignment_report["Mutations"]
-        ]
+) -> ty.List[entities.Substitution]:
+    "Substitution entities for every mutation in an alignment report."
+    return [
+        substitution(alignment, mtn)
+        for mtn in alignment_report["Mutations"]
+    ]
 
 
 AlignmentEntities = ty.Dict[str, ty.List[ty.NamedTuple]]
 
 
-def make_entities(
-    sequence: entities.Sequence,
+def make_entities_batch(
+    sequences: ty.Sequence[entities.Sequence],
     genotype: str,
     subgenotype: ty.Optional[str],
     genes: ty.List[str],
-) -> AlignmentEntities:
-    "Construct Alignment and Substitution entities from a sequence."
+) -> ty.List[AlignmentEntities]:
+    """Construct Alignment and Substitution entities for several sequences.
+
+    The aligner amortizes its startup cost over everything in its input
+    FASTA, so sequences that share a profile and gene list are aligned
+    with a single invocation. Reports are matched back to sequences by
+    input order, and the result list is parallel to `sequences`.
+    """
+    if not sequences:
+        return []
+    # Imported here so that command paths that never align anything
+    # (--help, format checks that fail early) don't pay for loading
+    # the aligner; sys.modules makes repeat imports free.
+    import pynucamino as pn
+
     pname = profile_name(genotype, subgenotype)
-    nt_seq = ensure_fasta_formatted(sequence.raw_nt_seq, "Aligned Sequence")
-    aln_data: ty.Any = pn.align(nt_seq, pname, genes)
-    aln_entities: AlignmentEntities = {"Alignment": [], "Substitution": []}
+    # Reports are matched back by input order, so the headers only
+    # need to be present, not unique; ids can be None (callers that
+    # align before assigning entity ids do this).
+    fasta = "\n".join(
+        ensure_fasta_formatted(
+            seq.raw_nt_seq,
+            seq.id.hex if seq.id is not None else "Reformatted",
+        )
+        for seq in sequences
+    )
+    aln_data: ty.Any = pn.align(fasta, pname, genes)
+    # Resolve each gene's report list once, before the per-sequence
+    # loop. Nucamino returns results indexed by gene uppercase.
+    # Yes, this is brittle. No, it's not worth "fixing".
+    gene_reports: ty.List[ty.Tuple[str, ty.Any]] = []
     for gene in genes:
-        # Nucamino returns results indexed by gene uppercase.
-        # Yes, this is brittle. No, it's not worth "fixing".
         reports: ty.Any = aln_data[gene.upper()]
-        assert len(reports) == 1
-        aln_report = reports[0]["Report"]
-        if aln_report is None:
-            import pprint
-
-            msg = "Unexpected Nucamino alginment output:\n{}".format(
-                pprint.pformat(aln_data)
-            )
-            raise ValueError(msg)
-        aln = alignment(sequence, gene, aln_report)
-        subs = substitutions(aln, aln_report)
-        if len(subs) == 0 or isinstance(subs[0], entities.Substitution):
+        assert len(reports) == len(sequences)
+        gene_reports.append((gene, reports))
+    results: ty.List[AlignmentEntities] = []
+    for idx, sequence in enumerate(sequences):
+        aln_entities: AlignmentEntities = {
+            "Alignment": [],
+            "Substitution": [],
+        }
+        for gene, reports in gene_reports:
+            aln_report = reports[idx]["Report"]
+            if aln_report is None:
+                import pprint
+
+                msg = "Unexpected Nucamino alginment output:\n{}".format(
+                    pprint.pformat(aln_data)
+                )
+                raise ValueError(msg)
+            fs_list = aln_report["FrameShifts"]
+            if fs_list:
+                # Frameshifted alignments are reported, not stored.
+                report.frameshift(
+                    gene=gene,
+                    positions=[int(fs["Position"]) for fs in fs_list],
+                )
+                continue
+            aln = alignment(sequence, gene, aln_report)
             aln_entities["Alignment"].append(aln)
-            for sub in subs:
-                assert isinstance(sub, entities.Substitution)
-                aln_entities["Substitution"].append(sub)
-        else:
-            report.frameshift(gene=gene, positions=[int(pos) for pos in subs])
+            aln_entities["Substitution"].extend(
+                substitutions(aln, aln_report)
+            )
+        results.append(aln_entities)
+    return results
+
+
+def make_entities(
+    sequence: entities.Sequence,
+    genotype: str,
+    subgenotype: ty.Optional[str],
+    genes: ty.List[str],
+) -> AlignmentEntities:
+    "Construct Alignment and Substitution entities from a sequence."
+    (aln_entities,) = make_entities_batch(
+        [sequence], genotype, subgenotype, genes
+    )
     return aln_entities
@@ -1,11 +1,12 @@
 "Functions for extracting shared-schema entities from submission-scheme cases"
 
 import enum
+import functools
+import operator
+import sys
 import typing as ty
 import uuid
 
-from Bio import SeqRecord as seqrecord
-
 import shared_schema.regimens as ss_regimens
 from shrl import case, exceptions, field
 
@@ -16,6 +17,11 @@ class TransformationException(exceptions.ShrlException):
     pass
 
 
+# Memoized so that every row sharing an enum value (genotype, gene,
+# sample kind, ...) holds the same string object instead of a fresh
+# lowercased copy; comparisons and dict hashing downstream then
+# short-circuit on identity.
+@functools.lru_cache(maxsize=None)
 def _get_enum_name(e_member: ty.Optional[field.FieldType]) -> ty.Optional[str]:
     if e_member is None:
         return None
@@ -27,7 +33,7 @@ def make_case(
     person_id: uuid.UUID, study_name: str, c: case.Case
 ) -> entities.Case:
     return entities.Case(
-        id=uuid.uuid4(),
+        id=util.random_uuid(),
         person_id=person_id,
         study_name=study_name,
         country=c.participant["country"],
@@ -48,7 +54,7 @@ def make_person(c: case.Case) -> entities.Person:
     sex = get_sex(c)
     sex_name = _get_enum_name(sex)
     return entities.Person(
-        id=uuid.uuid4(),
+        id=util.random_uuid(),
         sex=sex_name,
         ethnicity=c.participant["ethnicity"],
         year_of_birth=c.participant["year_of_birth"],
@@ -67,92 +73,118 @@ def make_loss_to_followup(
     )
 
 
+_BEHAVIOR_FIELDS = (
+    "sex_ori",
+    "idu",
+    "idu_recent",
+    "ndu",
+    "ndu_recent",
+    "prison",
+)
+
+_BEHAVIOR_GETTER = operator.itemgetter(*_BEHAVIOR_FIELDS)
+
+
 def make_behavior_data(
     case_id: uuid.UUID, c: case.Case
 ) -> entities.BehaviorData:
-    id = uuid.uuid4()
-
-    bhv = c.behavior
-    sex_ori = _get_enum_name(bhv.get("sex_ori"))
-
+    # parse_behavior always populates all six keys, so one C-level
+    # fetch replaces six dict probes per case.
+    sex_ori, idu, idu_recent, ndu, ndu_recent, prison = _BEHAVIOR_GETTER(
+        c.behavior
+    )
     return entities.BehaviorData(
-        id=id,
+        id=util.random_uuid(),
         case_id=case_id,
-        sex_ori=sex_ori,
-        idu=bhv.get("idu"),
-        idu_recent=bhv.get("idu_recent"),
-        ndu=bhv.get("ndu"),
-        ndu_recent=bhv.get("ndu_recent"),
-        prison=bhv.get("prison"),
+        sex_ori=_get_enum_name(sex_ori),
+        idu=idu,
+        idu_recent=idu_recent,
+        ndu=ndu,
+        ndu_recent=ndu_recent,
+        prison=prison,
     )
 
 
+_CLINICAL_FIELDS = (
+    "kind",
+    "hiv",
+    "hbv",
+    "ost",
+    "cirr",
+    "fibrosis",
+    "inflamation",
+    "metavir_by",
+    "stiff",
+    "alt",
+    "ast",
+    "crt",
+    "egfr",
+    "ctp",
+    "meld",
+    "ishak",
+    "bil",
+    "hemo",
+    "alb",
+    "inr",
+    "phos",
+    "urea",
+    "plate",
+    "CD4",
+    "crp",
+    "il28b",
+    "asc",
+    "var_bleed",
+    "hep_car",
+    "transpl",
+    "vl",
+)
+
+# One C-level call fetches all the clinical values, instead of a
+# Python-level dict probe per field per row.
+_CLINICAL_GETTER = operator.itemgetter(*_CLINICAL_FIELDS)
+
+
 def make_clinical_data(
     case_id: uuid.UUID, c: case.Case
 ) -> ty.List[entities.ClinicalData]:
-    flds = (
-        "kind",
-        "hiv",
-        "hbv",
-        "ost",
-        "cirr",
-        "fibrosis",
-        "inflamation",
-        "metavir_by",
-        "stiff",
-        "alt",
-        "ast",
-        "crt",
-        "egfr",
-        "ctp",
-        "meld",
-        "ishak",
-        "bil",
-        "hemo",
-        "alb",
-        "inr",
-        "phos",
-        "urea",
-        "plate",
-        "CD4",
-        "crp",
-        "il28b",
-        "asc",
-        "var_bleed",
-        "hep_car",
-        "transpl",
-        "vl",
-    )
-
     def parse_one(src: case.Clinical) -> ty.Optional[entities.ClinicalData]:
-        kwargs = {fld: src.values[fld] for fld in flds}
-        kwargs["kind"] = _get_enum_name(kwargs.get("kind"))
-        kwargs["il28b"] = _get_enum_name(kwargs.get("il28b"))
+        kwargs = dict(zip(_CLINICAL_FIELDS, _CLINICAL_GETTER(src.values)))
+        kwargs["kind"] = _get_enum_name(kwargs["kind"])
+        kwargs["il28b"] = _get_enum_name(kwargs["il28b"])
         if all(v is None for v in kwargs.values()):
             return None  # Skip empty records
         return entities.ClinicalData(
-            id=uuid.uuid4(), case_id=case_id, **kwargs
+            id=util.random_uuid(), case_id=case_id, **kwargs
         )
 
-    return [
-        parse_one(clinical)
-        for clinical in c.clinical
-        if parse_one(clinical) is not None
-    ]
+    result = []
+    for clinical in c.clinical:
+        parsed = parse_one(clinical)
+        if parsed is not None:
+            result.append(parsed)
+    return result
+
+
+# The same regimen string ("SOF+LDV 12 weeks", etc.) recurs across
+# most of a study's participants; parsing it to a canonical regimen
+# is pure, so the result is memoized per source string.
+@functools.lru_cache(maxsize=1024)
+def _parse_regimen(src: str) -> ss_regimens.Regimen:
+    expanded = ss_regimens.standard.expand(src)
+    return ss_regimens.cannonical.from_string(expanded)
 
 
 def make_treatment_data(
     rreg: util.RegimenRegistry, case_id: uuid.UUID, c: case.Case
 ) -> ty.List[entities.TreatmentData]:
     def tx_data(cln: case.Clinical) -> entities.TreatmentData:
-        tx_id = uuid.uuid4()
+        tx_id = util.random_uuid()
 
         def get_reg_id(key: str) -> ty.Optional[uuid.UUID]:
             src = cln.values.get(key)
             if src is None:
                 return None
-            expanded = ss_regimens.standard.expand(src)
-            reg = ss_regimens.cannonical.from_string(expanded)
+            reg = _parse_regimen(src)
             reg_id = rreg.get_or_create_id(reg)
             return reg_id
 
@@ -181,8 +213,13 @@ def make_isolate_entities(
         "Alignment": [],
         "Substitution": [],
     }
+    # Sequences that share a profile and gene are aligned together so
+    # the aligner's startup cost is paid once per group instead of once
+    # per sequence.
+    AlignKey = ty.Tuple[str, ty.Optional[str], str]
+    pending: ty.Dict[AlignKey, ty.List[entities.Sequence]] = {}
     for clinical in c.clinical:
-        isolate = entities.Isolate(id=uuid.uuid4(), type="clinical")
+        isolate = entities.Isolate(id=util.random_uuid(), type="clinical")
         results["Isolate"].append(isolate)
         clinical_isolate = entities.ClinicalIsolate(
             isolate_id=isolate.id,
@@ -195,11 +232,15 @@ def make_isolate_entities(
             if seq_id is None:
                 msg = f"Missing sequence id for case:\n{c}"
                 raise TransformationException(msg)
-            else:
+            elif not isinstance(seq_id, str):
+                # Numeric sequence ids come out of the parser as ints.
                 seq_id = str(seq_id)
-            raw_seq: seqrecord.SeqRecord = seq_registry.get(seq_id)
+            raw_seq: util.SeqLike = seq_registry.get(seq_id)
             sub_gt_src = seq.get("subegnotype", None)
-            sub_gt = str(sub_gt_src) if sub_gt_src is not None else None
+            if sub_gt_src is not None:
+                sub_gt: ty.Optional[str] = sys.intern(str(sub_gt_src))
+            else:
+                sub_gt = None
             gene_str = _get_enum_name(seq["gene"])
             msg = f"Missing gene label for case:\n{c}"
             assert gene_str is not None, msg
@@ -207,7 +248,7 @@ def make_isolate_entities(
             msg = f"Missing genotype information for case:\n{c}"
             assert genotype_str is not None, msg
             sequence = entities.Sequence(
-                id=uuid.uuid4(),
+                id=util.random_uuid(),
                 isolate_id=isolate.id,
                 genotype=genotype_str,
                 subgenotype=sub_gt,
@@ -217,25 +258,36 @@ def make_isolate_entities(
                 raw_nt_seq=str(raw_seq.seq),
                 notes=seq["seq_notes"],
             )
-            try:
-                aln_entities = align.make_entities(
-                    sequence=sequence,
-                    genotype=genotype_str,
-                    subgenotype=sub_gt,
-                    genes=[gene_str],
-                )
-            except ValueError:
-                import pprint
-
-                msg = "Misalignment while parsing case:\n{}".format(
-                    pprint.pformat(c)
-                )
-                raise ValueError(msg)
-
-            for kind, ents in aln_entities.items():
-                results[kind].extend(ents)
+            pending.setdefault(
+                (genotype_str, sub_gt, gene_str), []
+            ).append(sequence)
             results["Sequence"].append(sequence)
 
+    for (genotype_str, sub_gt, gene_str), group in pending.items():
+        try:
+            aligned = align.make_entities_batch(
+                sequences=group,
+                genotype=genotype_str,
+                subgenotype=sub_gt,
+                genes=[gene_str],
+            )
+        except ValueError:
+            import pprint
+
+            msg = "Misalignment while parsing case:\n{}".format(
+                pprint.pformat(c)
+            )
+            raise ValueError(msg)
+
+        # Batch results only ever hold these two kinds; extending the
+        # bound lists directly beats re-dispatching through the
+        # results dict for every entity batch.
+        alignments = results["Alignment"]
+        substitutions = results["Substitution"]
+        for aln_entities in aligned:
+            alignments.extend(aln_entities["Alignment"])
+            substitutions.extend(aln_entities["Substitution"])
+
     return results
 
 
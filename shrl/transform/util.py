@@ -1,10 +1,10 @@
+import concurrent.futures
 import logging
+import os
 import pathlib
 import typing as ty
 import uuid
 
-import Bio.SeqIO as seqio
-import Bio.SeqRecord as seqrecord
 import sqlalchemy.sql as sql
 
 import shared_schema.dao as dao
@@ -12,6 +12,31 @@ import shared_schema.regimens as ss_regimens
 
 log = logging.getLogger(__name__)
 
+# Entity construction asks for a UUID per row (and per substitution),
+# which adds up to tens of thousands of os.urandom calls on a large
+# study. Drawing the randomness in slabs replaces a getrandom syscall
+# per UUID with one per _UUID_POOL_SIZE UUIDs.
+_UUID_POOL_SIZE = 1024
+_uuid_buf = b""
+_uuid_pos = 0
+
+
+def random_uuid() -> uuid.UUID:
+    """A pooled equivalent of uuid.uuid4().
+
+    Produces the same RFC 4122 version-4 UUIDs from the same urandom
+    source, but fetches the random bytes in large batches.
+    """
+    global _uuid_buf, _uuid_pos
+    if _uuid_pos >= len(_uuid_buf):
+        _uuid_buf = os.urandom(16 * _UUID_POOL_SIZE)
+        _uuid_pos = 0
+    raw = bytearray(_uuid_buf[_uuid_pos:_uuid_pos + 16])
+    _uuid_pos += 16
+    raw[6] = (raw[6] & 0x0F) | 0x40
+    raw[8] = (raw[8] & 0x3F) | 0x80
+    return uuid.UUID(bytes=bytes(raw))
+
 
 class RegimenRegistry(object):
     def __init__(self) -> None:
@@ -55,12 +80,13 @@ class RegimenRegistry(object):
 
     def get_or_create_id(self, regimen: ss_regimens.Regimen) -> uuid.UUID:
         """Finds or creates a regimen in the registry"""
-        if regimen in self:
-            reg_id, _ = self.get(regimen)
-            return reg_id
-        else:
-            reg_id, _ = self.add(regimen)
-            return reg_id
+        # One hash and one probe; Regimen.__hash__ walks the drug
+        # inclusions, so the contains-then-get dance did that twice.
+        entry = self._storage.get(hash(regimen))
+        if entry is not None:
+            return entry[0]
+        reg_id, _ = self.add(regimen)
+        return reg_id
 
     def sync_to_dao(self, dao: dao.DAO) -> None:
         """Save new regimens to the DAO
@@ -69,26 +95,62 @@ class RegimenRegistry(object):
         registry exists in the database. If it doesn't, create it.
         """
         log.info("Syncing regimens to the database")
+        # One query finds the regimens that already exist, and the new
+        # ones (plus all their drug inclusions) are written with one
+        # executemany each — instead of a lookup and two inserts per
+        # registered regimen.
+        existing = {reg.id for reg in dao.query(dao.regimen.select())}
+        reg_rows = []
+        incl_values: ty.List[ty.Dict[str, ty.Any]] = []
         for reg_id, regimen in self.values():
-            db_regimen = dao.get_regimen(reg_id=reg_id)
-            if db_regimen is None:
-                log.info("Creating new regimen: {reg}".format(reg=regimen))
-                create_stm = dao.regimen.insert().values(id=reg_id, name=None)
-                dao.command(create_stm)
-                incl_values = list(
-                    {"regimen_id": reg_id, **incl._asdict()}
-                    for incl in ss_regimens.cannonical.drug_inclusions(regimen)
-                )
-                incl_keys = incl_values[0].keys()
-                incl_stm = dao.regimendruginclusion.insert().values(
-                    **{nm: sql.bindparam(nm) for nm in incl_keys}
-                )
-                dao.command(incl_stm, incl_values)
+            if reg_id in existing:
+                continue
+            log.info("Creating new regimen: {reg}".format(reg=regimen))
+            reg_rows.append({"id": reg_id, "name": None})
+            incl_values.extend(
+                {"regimen_id": reg_id, **incl._asdict()}
+                for incl in ss_regimens.cannonical.drug_inclusions(regimen)
+            )
+        if not reg_rows:
+            return
+        reg_stm = dao.regimen.insert().values(
+            id=sql.bindparam("id"), name=sql.bindparam("name")
+        )
+        dao.command(reg_stm, reg_rows)
+        if incl_values:
+            incl_keys = incl_values[0].keys()
+            incl_stm = dao.regimendruginclusion.insert().values(
+                **{nm: sql.bindparam(nm) for nm in incl_keys}
+            )
+            dao.command(incl_stm, incl_values)
 
 
-class SequenceRegistry(object):
+class FastaRecord(ty.NamedTuple):
+    """A FASTA record parsed without SeqRecord overhead.
+
+    Carries just the attributes the registry reads: `id` and `name`
+    are the first word of the title line, and `seq` is the sequence
+    as a plain string.
+    """
+
+    id: str
+    name: str
+    seq: str
+
+
+# Anything with the id/name/seq attributes the registry reads; both
+# BioPython SeqRecords and lightweight FastaRecords qualify. BioPython
+# itself is only imported for type checking (and lazily in file_seqs)
+# so that RegimenRegistry consumers don't pay its startup cost.
+if ty.TYPE_CHECKING:
+    import Bio.SeqRecord as seqrecord
 
-    SEQ_FILE_FORMAT = "fasta"
+    SeqLike = ty.Union[seqrecord.SeqRecord, FastaRecord]
+else:
+    SeqLike = ty.Any
+
+
+class SequenceRegistry(object):
 
     def __init__(self) -> None:
         """Manages access to genetic sequences
@@ -96,14 +158,13 @@ class SequenceRegistry(object):
         Takes an iterable of biopython SeqRecords, extracts an ID from
         each one, and stores them for random access.
         """
-        self._seq_store: ty.Dict[str, seqrecord.SeqRecord] = dict()
+        self._seq_store: ty.Dict[str, SeqLike] = dict()
         self._hash_store: ty.Set[int] = set()
-        self._id_store: ty.Set[str] = set()
 
     def __contains__(self, seq_id: str) -> bool:
         return seq_id in self._seq_store
 
-    def get(self, seq_id: str) -> seqrecord.SeqRecord:
+    def get(self, seq_id: str) -> SeqLike:
         if seq_id not in self:
             msg = "Missing sequence with id '{}'".format(seq_id)
             raise KeyError(msg)
@@ -111,7 +172,7 @@ class SequenceRegistry(object):
             return self._seq_store[seq_id]
 
     @staticmethod
-    def id_function(seq: seqrecord.SeqRecord) -> str:
+    def id_function(seq: SeqLike) -> str:
         """Get a sequence's ID from its BioPython sequence object
 
         When loading sequences from FASTA files, this function is
@@ -124,7 +185,7 @@ class SequenceRegistry(object):
         return str(seq.id)
 
     @staticmethod
-    def hash_key(bio_seq: seqrecord.SeqRecord) -> ty.Tuple[str, str]:
+    def hash_key(bio_seq: SeqLike) -> ty.Tuple[str, str]:
         """Returns a tuple of the fields on an input fasta sequence object
         that should be considered for the sequence's hash
         value. Default is name and sequence."""
@@ -133,13 +194,15 @@ class SequenceRegistry(object):
         return (name, seq)
 
     @classmethod
-    def sequence_hash(cls, seq: seqrecord.SeqRecord) -> int:
+    def sequence_hash(cls, seq: SeqLike) -> int:
         key = cls.hash_key(seq)
         return hash(key)
 
-    def check_in_sequence(self, sequence: seqrecord.SeqRecord) -> None:
+    def check_in_sequence(self, sequence: SeqLike) -> str:
         """Get a sequence's hash value and add it to the repository's hash
-        store, checking that we're not adding duplicates"""
+        store, checking that we're not adding duplicates.
+
+        Returns the sequence's id, so callers don't re-derive it."""
         hash_value = self.sequence_hash(sequence)
         if hash_value in self._hash_store:
             msg = "Duplicate sequence: name='{}'".format(sequence.name)
@@ -149,12 +212,12 @@ class SequenceRegistry(object):
             msg = "Duplicate sequence id: id='{}'".format(seq_id)
             raise ValueError(msg)
         self._hash_store.add(hash_value)
+        return seq_id
 
-    def add_seqs(self, sequences: ty.Iterable[seqrecord.SeqRecord]) -> None:
+    def add_seqs(self, sequences: ty.Iterable[SeqLike]) -> None:
         "Add a sequence of BioPython seq objects"
         for seq in sequences:
-            self.check_in_sequence(seq)
-            seq_id = self.id_function(seq)
+            seq_id = self.check_in_sequence(seq)
             self._seq_store[seq_id] = seq
 
     def add_file(self, filename: ty.Union[str, pathlib.Path]) -> None:
@@ -164,15 +227,31 @@ class SequenceRegistry(object):
     @classmethod
     def file_seqs(
         cls, filename: ty.Union[str, pathlib.Path]
-    ) -> ty.Iterable[seqrecord.SeqRecord]:
-        "Load sequences from a file"
+    ) -> ty.Iterator[FastaRecord]:
+        """Load sequences from a FASTA file
+
+        Uses BioPython's low-level FASTA parser, which skips the
+        SeqRecord/Seq object construction that dominates SeqIO.parse.
+        Records are yielded as they're parsed, so sequential callers
+        hold one record in memory at a time instead of the whole file.
+        """
+        from Bio.SeqIO.FastaIO import SimpleFastaParser
+
         with open(filename) as inf:
-            seqs = list(seqio.parse(inf, cls.SEQ_FILE_FORMAT))
-        return seqs
+            for title, seq in SimpleFastaParser(inf):
+                name = title.split(None, 1)[0] if title else ""
+                yield FastaRecord(id=name, name=name, seq=seq)
+
+    @classmethod
+    def _file_seqs_eager(
+        cls, filename: ty.Union[str, pathlib.Path]
+    ) -> ty.List[FastaRecord]:
+        "Materialized file_seqs, so thread-pool workers do the parsing."
+        return list(cls.file_seqs(filename))
 
     @classmethod
     def from_seqs(
-        cls, seqs: ty.Iterable[seqrecord.SeqRecord]
+        cls, seqs: ty.Iterable[SeqLike]
     ) -> "SequenceRegistry":
         repository = cls()
         repository.add_seqs(seqs)
@@ -183,6 +262,17 @@ class SequenceRegistry(object):
         cls, filenames: ty.Iterable[ty.Union[str, pathlib.Path]]
     ) -> "SequenceRegistry":
         repository = cls()
-        for filename in filenames:
-            repository.add_file(filename)
+        filepaths = list(filenames)
+        if len(filepaths) <= 1:
+            for filename in filepaths:
+                repository.add_file(filename)
+            return repository
+        # Reading FASTA files is I/O bound (the GIL is released during
+        # reads), so files are parsed in a thread pool. Results are
+        # merged serially, in input order, so the duplicate checks in
+        # add_seqs stay single-threaded and deterministic.
+        max_workers = min(32, len(filepaths))
+        with concurrent.futures.ThreadPoolExecutor(max_workers) as executor:
+            for seqs in executor.map(cls._file_seqs_eager, filepaths):
+                repository.add_seqs(seqs)
         return repository